@@ -0,0 +1,127 @@
+import pandas as pd
+from datetime import date, datetime
+from pandas.io.parsers import TextParser
+
+def open_excel_file(file_path):
+    """
+    Open a workbook with the Rust-based calamine reader, falling back to
+    openpyxl for files calamine rejects
+    """
+    try:
+        return pd.ExcelFile(file_path, engine="calamine")
+    except Exception:
+        # read_only streams rows instead of building the full workbook DOM
+        return pd.ExcelFile(
+            file_path,
+            engine="openpyxl",
+            engine_kwargs={"read_only": True, "data_only": True}
+        )
+
+def _calamine_cell(value):
+    """
+    Convert a calamine cell value the way pandas' calamine reader does:
+    whole floats become ints and dates become datetimes
+    """
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+def _openpyxl_cell(cell):
+    """
+    Convert an openpyxl cell the way pandas' openpyxl reader does: empty
+    cells become "", error cells NaN and whole numbers ints
+    """
+    if cell.value is None:
+        return ""
+    if cell.data_type == "e":
+        return float("nan")
+    if cell.data_type == "n":
+        return int(cell.value) if cell.value == int(cell.value) else float(cell.value)
+    return cell.value
+
+def read_sheet_sample(excel_file, sheet_name, sample_rows):
+    """
+    Read the header and first sample_rows rows of a sheet, plus its number
+    of data rows (header excluded)
+    
+    calamine parses the whole sheet as soon as it is fetched, whatever nrows
+    says, so the sheet is fetched once and the empty check, the sample and
+    the row count all come from that one parse. openpyxl sheets are streamed
+    once for both. The sample rows are turned into a DataFrame with the same
+    parser pd.read_excel uses, so headers and dtypes match
+    excel_file.parse(sheet_name, nrows=sample_rows).
+    
+    On both engines the row count stops at the last row holding a value;
+    formatted but empty rows below it are not counted.
+    
+    Returns:
+        (DataFrame of the sample rows, number of data rows); an empty sheet
+        gives an empty DataFrame and 0
+    """
+    if excel_file.engine == "calamine":
+        sheet = excel_file.book.get_sheet_by_name(sheet_name)
+        if sheet.height == 0:
+            return pd.DataFrame(), 0
+        
+        rows = sheet.to_python(skip_empty_area=False, nrows=sample_rows + 1)
+        rows = [[_calamine_cell(value) for value in row] for row in rows]
+        df = TextParser(rows, header=0, skip_blank_lines=False).read(sample_rows)
+        
+        # total_height is the index of the last used row, i.e. the number
+        # of rows below the header row
+        return df, sheet.total_height
+    
+    # openpyxl: the stored dimensions are often stale, so ignore them (as
+    # pandas does) and stream the rows
+    ws = excel_file.book[sheet_name]
+    ws.reset_dimensions()
+    
+    rows = []
+    last_row_with_data = last_sample_row = -1
+    for row_number, row in enumerate(ws.iter_rows()):
+        if row_number <= sample_rows:
+            # Keep the header and sample rows, converted like pandas does
+            values = [_openpyxl_cell(cell) for cell in row]
+            while values and values[-1] == "":
+                values.pop()
+            rows.append(values)
+            if values:
+                last_row_with_data = last_sample_row = row_number
+        elif any(cell.value is not None and cell.value != "" for cell in row):
+            last_row_with_data = row_number
+    
+    if last_row_with_data < 0:
+        return pd.DataFrame(), 0
+    if last_sample_row < 0:
+        # Values only below the sample rows: pandas reads nothing for them
+        return pd.DataFrame(), last_row_with_data
+    
+    # Like pandas, drop empty rows at the end of the rows read for the sample
+    rows = rows[:last_sample_row + 1]
+    width = max(len(values) for values in rows)
+    rows = [values + [""] * (width - len(values)) for values in rows]
+    df = TextParser(rows, header=0, skip_blank_lines=False).read(sample_rows)
+    
+    # Row numbers start at the header row, so the last one is the data row count
+    return df, last_row_with_data
+
+def sample_records(df):
+    """
+    Turn the sample rows into a list of records with missing values as None
+    
+    Floats stay Python floats, which orjson writes exactly (DataFrame.to_json
+    rounds them to at most 15 significant digits). Timestamps and other
+    values orjson cannot encode are left to json_default.
+    """
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def json_default(obj):
+    """
+    orjson fallback: ISO strings for Timestamps and other date/time values,
+    str() for anything else
+    """
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
@@ -1,46 +1,69 @@
-import pandas as pd
-import json
+import orjson
 import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def process_excel_files(folder_path, output_folder=None, sample_rows=3):
+from excel_sheets import json_default, open_excel_file, read_sheet_sample, sample_records
+
+# Extensions (lower case) of the files picked up from the input folder
+EXCEL_EXTENSIONS = frozenset({'.xlsx', '.xls', '.xlsm'})
+
+# Output files are written in binary mode through a 1 MiB buffer
+WRITE_BUFFER_SIZE = 1 << 20
+
+def _dump_json(data):
     """
-    Process all Excel files in a folder and create JSON files with column names and sample data.
-    
-    Args:
-        folder_path: Path to the folder containing Excel files
-        output_folder: Path to save JSON files (if None, saves in the same folder)
-        sample_rows: Number of sample rows to extract from each sheet
+    Encode data as indented, newline-terminated UTF-8 JSON bytes with orjson.
     """
+    return orjson.dumps(
+        data,
+        default=json_default,
+        option=(orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    )
+
+def _json_base_name(filename):
+    """
+    Base name shared by the _info.json and _error.json files of a workbook.
+    """
+    return filename.rsplit('.', 1)[0]
+
+def _is_up_to_date(entry, output_dir):
+    """
+    Check whether the _info.json of a workbook (a scandir entry) exists and is
+    at least as new as the workbook itself.
+    """
+    json_path = output_dir / (_json_base_name(entry.name) + '_info.json')
+    try:
+        return json_path.stat().st_mtime >= entry.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+def _process_one_file(args):
+    """
+    Process a single Excel file and write its JSON file.
     
-    # Create output folder if specified and doesn't exist
-    if output_folder:
-        os.makedirs(output_folder, exist_ok=True)
-    else:
-        output_folder = folder_path
-    
-    # Get all Excel files in the folder
-    excel_extensions = ['.xlsx', '.xls', '.xlsm']
-    excel_files = []
-    
-    for file in os.listdir(folder_path):
-        if any(file.lower().endswith(ext) for ext in excel_extensions):
-            excel_files.append(file)
-    
-    if not excel_files:
-        print("No Excel files found in the specified folder.")
-        return
-    
-    print(f"Found {len(excel_files)} Excel file(s) to process...")
+    Runs in a worker process, so progress messages are collected and returned
+    instead of printed to keep the output of parallel workers from interleaving.
     
-    # Process each Excel file
-    for filename in excel_files:
-        file_path = os.path.join(folder_path, filename)
-        print(f"\nProcessing: {filename}")
+    Args:
+        args: Tuple of (file_path, output_folder Path, sample_rows)
         
-        try:
-            # Get all sheet names
-            excel_file = pd.ExcelFile(file_path)
+    Returns:
+        List of progress messages for this file
+    """
+    file_path, output_folder, sample_rows = args
+    filename = os.path.basename(file_path)
+    base_name = _json_base_name(filename)
+    messages = [f"\nProcessing: {filename}"]
+    
+    try:
+        # Open the workbook once; every sheet is read from this handle and it is
+        # closed as soon as the sheets have been read
+        with open_excel_file(file_path) as excel_file:
             sheet_names = excel_file.sheet_names
             
             # Initialize dictionary to store file data
@@ -52,103 +75,201 @@ def process_excel_files(folder_path, output_folder=None, sample_rows=3):
             
             # Process each sheet
             for sheet_name in sheet_names:
-                print(f"  - Processing sheet: {sheet_name}")
+                messages.append(f"  - Processing sheet: {sheet_name}")
                 
                 try:
-                    # Read the sheet
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    
-                    # Get column names and data types
-                    columns_info = []
-                    for col in df.columns:
-                        columns_info.append({
-                            "name": str(col),
-                            "dtype": str(df[col].dtype)
-                        })
+                    # Read only the header and sample rows from the already opened
+                    # workbook, with the row count from the same sheet; empty
+                    # sheets come back as an empty frame and 0 rows
+                    df, total_rows = read_sheet_sample(excel_file, sheet_name, sample_rows)
                     
-                    # Get sample data (first few rows)
-                    sample_data = df.head(sample_rows).fillna("").to_dict('records')
+                    # Get column names and data types in one pass over df.dtypes
+                    columns_info = [
+                        {"name": name, "dtype": dtype}
+                        for name, dtype in zip(df.columns.map(str), df.dtypes.astype(str))
+                    ]
                     
-                    # Convert any non-serializable objects to strings
-                    for row in sample_data:
-                        for key, value in row.items():
-                            if pd.isna(value):
-                                row[key] = None
-                            elif hasattr(value, 'isoformat'):  # Handle datetime
-                                row[key] = value.isoformat()
-                            else:
-                                try:
-                                    # Test if JSON serializable
-                                    json.dumps(value)
-                                except:
-                                    row[key] = str(value)
+                    # Get sample data (first few rows), missing values as None;
+                    # datetimes are written as ISO strings by json_default
+                    sample_data = sample_records(df)
                     
                     # Store sheet information
                     file_data["sheets"][sheet_name] = {
-                        "total_rows": len(df),
+                        "total_rows": total_rows,
                         "total_columns": len(df.columns),
                         "columns": columns_info,
                         f"sample_data_first_{sample_rows}_rows": sample_data
                     }
                     
                 except Exception as e:
-                    print(f"    Error processing sheet {sheet_name}: {str(e)}")
+                    messages.append(f"    Error processing sheet {sheet_name}: {str(e)}")
                     file_data["sheets"][sheet_name] = {
                         "error": f"Failed to process sheet: {str(e)}"
                     }
-            
-            # Save JSON file
-            json_filename = os.path.splitext(filename)[0] + '_info.json'
-            json_path = os.path.join(output_folder, json_filename)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(file_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"  ✓ Saved: {json_filename}")
-            
-        except Exception as e:
-            print(f"  ✗ Error processing file {filename}: {str(e)}")
-            
-            # Create error JSON
-            error_data = {
-                "filename": filename,
-                "error": f"Failed to process file: {str(e)}"
-            }
-            
-            json_filename = os.path.splitext(filename)[0] + '_error.json'
-            json_path = os.path.join(output_folder, json_filename)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(error_data, f, indent=2)
+        
+        # Save JSON file
+        json_filename = base_name + '_info.json'
+        json_path = output_folder / json_filename
+        json_bytes = _dump_json(file_data)
+        
+        with open(json_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(json_bytes)
+        
+        messages.append(f"  ✓ Saved: {json_filename}")
+        
+    except Exception as e:
+        messages.append(f"  ✗ Error processing file {filename}: {str(e)}")
+        
+        # Create error JSON
+        error_data = {
+            "filename": filename,
+            "error": f"Failed to process file: {str(e)}"
+        }
+        
+        json_filename = base_name + '_error.json'
+        json_path = output_folder / json_filename
+        
+        with open(json_path, 'wb') as f:
+            f.write(_dump_json(error_data))
+    
+    return messages
+
+def _map_files(tasks, workers):
+    """
+    Yield the _process_one_file result of each task, in order.
+    
+    A process pool is only started when more than one worker can be used; a
+    single file (or workers=1) is processed in-process to skip the pool's
+    start-up and pickling cost.
+    """
+    workers = min(workers or os.cpu_count(), len(tasks))
+    if workers <= 1:
+        yield from map(_process_one_file, tasks)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_process_one_file, tasks)
 
-def create_summary_json(folder_path, output_file=None):
+def process_excel_files(folder_path, output_folder=None, sample_rows=3, workers=None, force=False):
+    """
+    Process all Excel files in a folder and create JSON files with column names and sample data.
+    
+    Files whose JSON file is already newer than the workbook are skipped.
+    
+    Args:
+        folder_path: Path to the folder containing Excel files
+        output_folder: Path to save JSON files (if None, saves in the same folder)
+        sample_rows: Number of sample rows to extract from each sheet
+        workers: Number of worker processes (defaults to os.cpu_count())
+        force: Reprocess every file, even if its JSON file is up to date
+    """
+    
+    # Create output folder if specified and doesn't exist
+    if output_folder:
+        os.makedirs(output_folder, exist_ok=True)
+    else:
+        output_folder = folder_path
+    
+    # Get all Excel files in the folder (scandir entries carry their file type,
+    # so no extra stat call is needed per file)
+    with os.scandir(folder_path) as entries:
+        excel_files = [
+            entry for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in EXCEL_EXTENSIONS
+        ]
+    
+    if not excel_files:
+        print("No Excel files found in the specified folder.")
+        return
+    
+    print(f"Found {len(excel_files)} Excel file(s) to process...")
+    
+    # Skip files that have not changed since their JSON file was written
+    output_dir = Path(output_folder)
+    if not force:
+        changed_files = [entry for entry in excel_files if not _is_up_to_date(entry, output_dir)]
+        skipped = len(excel_files) - len(changed_files)
+        if skipped:
+            print(f"Skipping {skipped} unchanged file(s)")
+        excel_files = changed_files
+    
+    # Files are independent, so process them in parallel
+    tasks = [(entry.path, output_dir, sample_rows) for entry in excel_files]
+    
+    for messages in _map_files(tasks, workers):
+        # One write per file instead of a print per sheet
+        sys.stdout.write('\n'.join(messages) + '\n')
+
+def _summary_is_current(output_file, json_entries):
+    """
+    Check whether output_file already summarises exactly these per-file JSON
+    files, i.e. it lists the same number of files and is newer than all of them.
+    """
+    try:
+        summary_mtime = os.stat(output_file).st_mtime
+        with open(output_file, 'rb') as f:
+            header = f.read(64)
+    except OSError:
+        return False
+    
+    match = re.search(rb'"total_files_processed": (\d+)', header)
+    if match is None or int(match.group(1)) != len(json_entries):
+        return False
+    
+    return all(entry.stat().st_mtime < summary_mtime for entry in json_entries)
+
+def create_summary_json(folder_path, output_file=None, force=False):
     """
     Create a summary JSON file containing information from all processed Excel files.
+    
+    Each per-file JSON file is checked to parse and its bytes are then copied
+    straight into the summary instead of being re-encoded; files that do not
+    parse are skipped. When no per-file JSON changed since the last run the
+    existing summary is kept.
+    
+    Args:
+        folder_path: Folder containing the *_info.json files
+        output_file: Path of the summary file (defaults to all_files_summary.json in folder_path)
+        force: Rebuild the summary even if it is up to date
     """
     if output_file is None:
         output_file = os.path.join(folder_path, 'all_files_summary.json')
     
-    summary = {
-        "total_files_processed": 0,
-        "files": []
-    }
+    # Find all generated JSON files (empty files are left-overs of failed writes)
+    with os.scandir(folder_path) as entries:
+        json_entries = [
+            entry for entry in entries
+            if entry.name.endswith('_info.json') and entry.stat().st_size > 0
+        ]
     
-    # Find all generated JSON files
-    json_files = [f for f in os.listdir(folder_path) if f.endswith('_info.json')]
+    if not force and _summary_is_current(output_file, json_entries):
+        print(f"\nSummary is up to date: {output_file}")
+        return
     
-    for json_file in json_files:
-        json_path = os.path.join(folder_path, json_file)
+    # A truncated or corrupt file copied in as-is would make the whole summary
+    # invalid, so only files that parse are included
+    valid_entries = []
+    for entry in json_entries:
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-                summary["files"].append(file_data)
-                summary["total_files_processed"] += 1
-        except:
-            pass
+            with open(entry.path, 'rb') as src:
+                orjson.loads(src.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            print(f"Skipping {entry.name}: {str(e)}")
+            continue
+        valid_entries.append(entry)
     
     # Save summary
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2)
+    with open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE) as out:
+        out.write(b'{\n  "total_files_processed": %d,\n  "files": [\n' % len(valid_entries))
+        
+        for i, entry in enumerate(valid_entries):
+            if i:
+                out.write(b',\n')
+            with open(entry.path, 'rb') as src:
+                shutil.copyfileobj(src, out)
+        
+        # Per-file JSON already ends with a newline
+        out.write(b'  ]\n}\n')
     
     print(f"\nSummary saved to: {output_file}")
 
@@ -2,8 +2,11 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import threading
 import pandas as pd
+import os
 from pathlib import Path
 
+EXCEL_EXTENSIONS = frozenset({'.xlsx', '.xls', '.xlsm', '.xlsb'})
+
 class ExcelMergerGUI:
     def __init__(self, root):
         self.root = root
@@ -11,6 +14,7 @@ class ExcelMergerGUI:
         self.root.geometry("600x500")
         
         self.files_to_merge = []
+        self._files_set = set()  # Same paths, for fast duplicate checks
         self.merger = None
         
         self.setup_ui()
@@ -123,7 +127,8 @@ class ExcelMergerGUI:
         )
         
         for file in files:
-            if file not in self.files_to_merge:
+            if file not in self._files_set:
+                self._files_set.add(file)
                 self.files_to_merge.append(file)
                 self.file_listbox.insert(tk.END, Path(file).name)
     
@@ -131,18 +136,19 @@ class ExcelMergerGUI:
         folder = filedialog.askdirectory(title="Select Folder with Excel Files")
         
         if folder:
-            excel_extensions = ['.xlsx', '.xls', '.xlsm', '.xlsb']
-            for ext in excel_extensions:
-                for file in Path(folder).glob(f"*{ext}"):
-                    file_str = str(file)
-                    if file_str not in self.files_to_merge:
-                        self.files_to_merge.append(file_str)
-                        self.file_listbox.insert(tk.END, file.name)
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in EXCEL_EXTENSIONS:
+                        continue
+                    if entry.path not in self._files_set:
+                        self._files_set.add(entry.path)
+                        self.files_to_merge.append(entry.path)
+                        self.file_listbox.insert(tk.END, entry.name)
     
     def remove_selected(self):
         selected = self.file_listbox.curselection()
         for index in selected[::-1]:
-            self.files_to_merge.pop(index)
+            self._files_set.discard(self.files_to_merge.pop(index))
             self.file_listbox.delete(index)
     
     def start_merge(self):
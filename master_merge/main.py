@@ -2,26 +2,174 @@ import pandas as pd
 import os
 from pathlib import Path
 import warnings
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 import numpy as np
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import importlib.util
+import pickle
+import threading
 
-warnings.filterwarnings('ignore')
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# pandas loads python-calamine itself; only check that it is installed
+HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+# Read-only, values-only openpyxl reader settings
+OPENPYXL_FILE_KWARGS = {
+    'engine': 'openpyxl',
+    'engine_kwargs': {'read_only': True, 'data_only': True, 'keep_links': False}
+}
+
+EXCEL_EXTENSIONS = frozenset({'.xlsx', '.xls', '.xlsm', '.xlsb'})
+
+# Bump when the sheet loading or conversion code changes, so frames cached
+# by the old code are not reused
+CACHE_VERSION = 4
+
+# Cached workbooks not used for this many seconds are deleted
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Strings like '007' or ' 0123' whose leading zero is part of the value
+LEADING_ZERO_PATTERN = r'\s*[+-]?0\d'
+
+# Rows converted to Python objects at a time when streaming a sheet out
+EXPORT_CHUNK_ROWS = 10_000
+
+# Cell values xlsxwriter writes natively; anything else is written as text
+XLSX_CELL_TYPES = (str, bool, int, float, datetime, date, time, timedelta)
+
+# openpyxl warns about workbook features it skips while reading (data
+# validation, conditional formatting, ...); cell values are unaffected.
+# pandas 3 always uses copy-on-write, so there is no copy_on_write option
+# to set and no SettingWithCopyWarning to silence
+warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
 class ExcelMerger:
-    def __init__(self, input_dir=None, output_path="master_file.xlsx"):
+    # Substrings mapped to standardized names; the first key found wins
+    COLUMN_REPLACEMENTS = {
+        'truck': 'truck',
+        'vehicle': 'truck',
+        'unit': 'truck',
+        'truck_no': 'truck_number',
+        'truck_nbr': 'truck_number',
+        'truck_num': 'truck_number',
+        'truck#': 'truck_number',
+        'trk': 'truck',
+        'loc': 'location',
+        'gps': 'location',
+        'position': 'location',
+        'coord': 'location',
+        'lat': 'latitude',
+        'lon': 'longitude',
+        'long': 'longitude',
+        'status': 'status',
+        'state': 'status',
+        'condition': 'status',
+        'date': 'date',
+        'time': 'time',
+        'timestamp': 'datetime',
+        'driver': 'driver',
+        'operator': 'driver',
+        'load': 'load',
+        'cargo': 'load',
+        'weight': 'weight',
+        'destination': 'destination',
+        'dest': 'destination',
+        'origin': 'origin',
+        'src': 'origin',
+        'speed': 'speed',
+        'velocity': 'speed',
+        'fuel': 'fuel',
+        'mileage': 'mileage',
+        'odometer': 'mileage',
+        'temp': 'temperature',
+        'temperature': 'temperature',
+    }
+    
+    # Standardized columns that hold numbers
+    NUMERIC_COLUMNS = frozenset({
+        'weight', 'speed', 'mileage', 'latitude', 'longitude', 'temperature', 'fuel'
+    })
+    
+    def __init__(self, input_dir=None, output_path="master_file.xlsx", cache_dir=None, progress_queue=None,
+                 data_format=None, downcast_numeric=False):
         """
         Initialize Excel Merger
         
         Args:
             input_dir: Directory containing Excel files (optional)
             output_path: Path for the merged master file
+            cache_dir: Directory for cached parsed workbooks (optional)
+            progress_queue: Queue receiving ('file', done, total) updates (optional)
+            data_format: 'csv' or 'parquet' to write the merged rows to a file next
+                to the master file instead of its Master_Data sheet (optional)
+            downcast_numeric: Store merged numeric columns in the smallest dtype that
+                holds them; floats become float32, so keep off for precise values
         """
+        if data_format not in (None, 'csv', 'parquet'):
+            raise ValueError(f"Unsupported data format: {data_format}")
+            
         self.input_dir = input_dir
         self.output_path = output_path
+        self.cache_dir = cache_dir
+        self.progress_queue = progress_queue
+        self.data_format = data_format
+        self.downcast_numeric = downcast_numeric
         self.column_mappings = {}
         self.standardized_columns = {}
+        self._print_lock = threading.Lock()
+        self._column_cache = {}
+        self._column_automaton = self._build_column_automaton()
+        
+        # Cleaned column names that are converted to numbers: the numeric
+        # names themselves and the replacement keys mapping to them. The
+        # substring match is too loose for this ('Fuel card no', 'Plate No')
+        self._numeric_column_names = self.NUMERIC_COLUMNS.union(
+            key for key, value in self.COLUMN_REPLACEMENTS.items() if value in self.NUMERIC_COLUMNS
+        )
+        self._cache_ready = False
+        
+        # Cached frames depend on the loading code, the pandas version they
+        # were pickled with and the column mapping applied while loading
+        self._cache_salt = repr((
+            CACHE_VERSION, pd.__version__,
+            list(self.COLUMN_REPLACEMENTS.items()), sorted(self.NUMERIC_COLUMNS)
+        )).encode()
+        
+        # Prefer the Rust calamine reader; openpyxl is the fallback
+        if HAS_CALAMINE:
+            self._excel_file_kwargs = {'engine': 'calamine'}
+        else:
+            self._excel_file_kwargs = OPENPYXL_FILE_KWARGS
+        
+    def _build_column_automaton(self):
+        """
+        Build an Aho-Corasick automaton over the replacement keys
         
+        Returns:
+            Automaton yielding (priority, standardized name), or None if
+            pyahocorasick is not installed
+        """
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for priority, (key, value) in enumerate(self.COLUMN_REPLACEMENTS.items()):
+            automaton.add_word(key, (priority, value))
+        automaton.make_automaton()
+        return automaton
+    
     def find_excel_files(self, directory=None):
         """
         Find all Excel files in the specified directory
@@ -38,13 +186,10 @@ class ExcelMerger:
         if not directory:
             raise ValueError("No directory specified")
             
-        excel_extensions = ['.xlsx', '.xls', '.xlsm', '.xlsb']
-        excel_files = []
-        
-        for ext in excel_extensions:
-            excel_files.extend(Path(directory).glob(f"*{ext}"))
-            
-        return [str(f) for f in excel_files if f.is_file()]
+        # A single directory pass; extensions match case-insensitively
+        with os.scandir(directory) as entries:
+            return [entry.path for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in EXCEL_EXTENSIONS]
     
     def analyze_column(self, column_name):
         """
@@ -62,98 +207,249 @@ class ExcelMerger:
         # Convert to string and standardize
         col_str = str(column_name).strip().lower()
         
-        # Remove common prefixes/suffixes and standardize
-        replacements = {
-            'truck': 'truck',
-            'vehicle': 'truck',
-            'unit': 'truck',
-            'truck_no': 'truck_number',
-            'truck_nbr': 'truck_number',
-            'truck_num': 'truck_number',
-            'truck#': 'truck_number',
-            'trk': 'truck',
-            'loc': 'location',
-            'gps': 'location',
-            'position': 'location',
-            'coord': 'location',
-            'lat': 'latitude',
-            'lon': 'longitude',
-            'long': 'longitude',
-            'status': 'status',
-            'state': 'status',
-            'condition': 'status',
-            'date': 'date',
-            'time': 'time',
-            'timestamp': 'datetime',
-            'driver': 'driver',
-            'operator': 'driver',
-            'load': 'load',
-            'cargo': 'load',
-            'weight': 'weight',
-            'destination': 'destination',
-            'dest': 'destination',
-            'origin': 'origin',
-            'src': 'origin',
-            'speed': 'speed',
-            'velocity': 'speed',
-            'fuel': 'fuel',
-            'mileage': 'mileage',
-            'odometer': 'mileage',
-            'temp': 'temperature',
-            'temperature': 'temperature',
-        }
+        # The same headers repeat across sheets and files
+        if col_str not in self._column_cache:
+            self._column_cache[col_str] = self._match_column(col_str)
+        return self._column_cache[col_str]
+    
+    def _match_column(self, col_str):
+        """
+        Find the standardized name for a cleaned column name
+        
+        Args:
+            col_str: Lowercased, stripped column name
+            
+        Returns:
+            Standardized column name, or col_str if nothing matches
+        """
+        if self._column_automaton is not None:
+            # Keep dict order precedence: the earliest key that matches wins
+            matches = [match for _, match in self._column_automaton.iter(col_str)]
+            if matches:
+                return min(matches)[1]
+            return col_str
         
         # Try to match with standardized names
-        for key, value in replacements.items():
+        for key, value in self.COLUMN_REPLACEMENTS.items():
             if key in col_str:
                 return value
         
         # Return cleaned original
         return col_str
     
-    def extract_dataframes(self, excel_files):
+    def _cache_path(self, file_path):
         """
-        Extract dataframes from all Excel files and worksheets
+        Get the cache file for an Excel file
+        
+        The key combines a hash of the first megabyte of the file with
+        its modification time and size and the cache salt.
         
         Args:
-            excel_files: List of Excel file paths
+            file_path: Path of the Excel file
             
         Returns:
-            List of dictionaries with file info and dataframes
+            Path of the cache file
         """
-        all_data = []
+        stat = os.stat(file_path)
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(1 << 20))
+        digest.update(f"{stat.st_mtime_ns}:{stat.st_size}".encode())
+        digest.update(self._cache_salt)
+        return Path(self.cache_dir) / f"{digest.hexdigest()}.pkl"
+    
+    def _prepare_cache(self):
+        """
+        Create the cache directory and delete stale entries
+        
+        Cached workbooks are unpickled, so the directory is created private
+        to the user (mode 0o700) and one that other users can write to is
+        not used at all.
+        
+        Returns:
+            True if the cache can be used
+        """
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            
+            # POSIX only; Windows has no uid or mode bits to check
+            if hasattr(os, 'getuid'):
+                stat = os.stat(self.cache_dir)
+                if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+                    print(f"✗ Not using cache {self.cache_dir}: it is not private to this user")
+                    return False
+            
+            # Entries are touched when used, so old ones belong to changed or
+            # removed files, older code or an older column mapping
+            cutoff = datetime.now().timestamp() - CACHE_MAX_AGE
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(('.pkl', '.tmp')) and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError as e:
+            print(f"✗ Not using cache {self.cache_dir}: {str(e)}")
+            return False
+        
+        return True
+    
+    def _convert_numeric_columns(self, df, standardized_cols):
+        """
+        Convert columns named exactly like a numeric column to numbers in place
+        
+        Only columns whose cleaned name is a numeric standardized name or a
+        replacement key for one are converted; a column that only contains
+        such a key ('Fuel card no') keeps its values as they are.
         
-        for file_path in excel_files:
+        Only text columns are parsed; numeric, datetime, timedelta and bool
+        columns keep their dtype. Columns holding any value that cannot be
+        parsed as a number, or a string with a leading zero (IDs such as
+        card numbers), are left unchanged.
+        
+        Args:
+            df: Sheet dataframe
+            standardized_cols: Original to standardized column names
+        """
+        for col in standardized_cols:
+            if str(col).strip().lower() not in self._numeric_column_names:
+                continue
+            
+            series = df[col]
+            if not (pd.api.types.is_object_dtype(series) or isinstance(series.dtype, pd.StringDtype)):
+                continue
+            
             try:
-                # Read all sheets
-                xls = pd.ExcelFile(file_path)
-                sheet_names = xls.sheet_names
-                
-                for sheet_name in sheet_names:
+                has_leading_zero = series.str.match(LEADING_ZERO_PATTERN, na=False).any()
+            except AttributeError:
+                # No string values at all (e.g. only datetime objects)
+                has_leading_zero = False
+            if has_leading_zero:
+                continue
+            
+            try:
+                df[col] = pd.to_numeric(series)
+            except (ValueError, TypeError):
+                pass
+    
+    def _sheet_has_no_data(self, xls, sheet_name):
+        """
+        Check whether a sheet has no data rows without parsing it
+        
+        Only openpyxl can tell without parsing the sheet. calamine loads
+        the whole sheet first, which xls.parse would then do again, so
+        calamine sheets are only checked for data once they are parsed.
+        
+        Args:
+            xls: Open pandas ExcelFile
+            sheet_name: Name of the sheet
+            
+        Returns:
+            True if the sheet is known to have at most one (header) row
+        """
+        if xls.engine != 'openpyxl':
+            return False
+        
+        # Read-only sheets take their size from the <dimension> tag stored in
+        # the file; it can only be trusted to say that there is data
+        ws = xls.book[sheet_name]
+        max_row = ws.max_row
+        if max_row is None or max_row > 1:
+            return False
+        
+        # The tag is often stale, so confirm by streaming the rows below the
+        # header (pandas ignores the tag the same way before reading)
+        ws.reset_dimensions()
+        return not any(
+            any(value is not None and value != "" for value in row)
+            for row in ws.iter_rows(min_row=2, values_only=True)
+        )
+    
+    def _open_workbook(self, file_path):
+        """
+        Open an Excel file with the preferred reader
+        
+        Files calamine cannot open are retried with openpyxl.
+        
+        Args:
+            file_path: Path of the Excel file
+            
+        Returns:
+            Open pandas ExcelFile
+        """
+        try:
+            return pd.ExcelFile(file_path, **self._excel_file_kwargs)
+        except Exception as e:
+            if self._excel_file_kwargs['engine'] != 'calamine':
+                raise
+            with self._print_lock:
+                print(f"✗ Calamine could not open {Path(file_path).name}, retrying with openpyxl: {str(e)}")
+            return pd.ExcelFile(file_path, **OPENPYXL_FILE_KWARGS)
+    
+    def _load_one_file(self, file_path):
+        """
+        Load every non-empty worksheet of a single Excel file
+        
+        Args:
+            file_path: Path of the Excel file
+            
+        Returns:
+            List of dictionaries with sheet info and dataframes
+        """
+        file_data = []
+        cache_path = None
+        filename = Path(file_path).name
+        
+        if self._cache_ready:
+            try:
+                cache_path = self._cache_path(file_path)
+                if cache_path.exists():
+                    with open(cache_path, 'rb') as f:
+                        file_data = pickle.load(f)
+                    # Mark the entry as used so it is not pruned
+                    os.utime(cache_path)
+                    for data_info in file_data:
+                        data_info['file_path'] = file_path
+                        data_info['filename'] = filename
+                        with self._print_lock:
+                            print(f"✓ Cached: {filename} - Sheet: {data_info['sheet_name']} ({data_info['row_count']} rows)")
+                    return file_data
+            except Exception as e:
+                file_data = []
+                with self._print_lock:
+                    print(f"✗ Ignoring cache for {file_path}: {str(e)}")
+        
+        try:
+            # Open the workbook once and parse every sheet from that handle;
+            # closing it releases the reader's file handle
+            with self._open_workbook(file_path) as xls:
+                for sheet_name in xls.sheet_names:
                     try:
-                        # Try reading with different parameters
-                        df = pd.read_excel(
-                            file_path, 
-                            sheet_name=sheet_name,
-                            engine='openpyxl'
-                        )
+                        # Skip sheets with at most a header row without parsing them,
+                        # where the reader can tell
+                        if self._sheet_has_no_data(xls, sheet_name):
+                            continue
+                        
+                        # Text columns come back as pandas 3's str dtype (Arrow-backed
+                        # when pyarrow is installed), so no string conversion is done
+                        df = xls.parse(sheet_name)
                         
                         # Skip empty dataframes
                         if df.empty or df.shape[0] == 0:
                             continue
                             
                         # Clean column names
-                        df.columns = [str(col).strip() for col in df.columns]
+                        df.columns = df.columns.astype(str).str.strip()
                         
                         # Analyze and standardize column names for this sheet
-                        standardized_cols = {}
-                        for col in df.columns:
-                            std_col = self.analyze_column(col)
-                            if std_col:
-                                standardized_cols[col] = std_col
+                        std_names = df.columns.map(self.analyze_column)
+                        standardized_cols = {
+                            col: std_col for col, std_col in zip(df.columns, std_names) if std_col
+                        }
+                        
+                        self._convert_numeric_columns(df, standardized_cols)
                         
-                        all_data.append({
+                        file_data.append({
                             'file_path': file_path,
+                            'filename': filename,
                             'sheet_name': sheet_name,
                             'original_columns': df.columns.tolist(),
                             'standardized_columns': standardized_cols,
@@ -161,13 +457,53 @@ class ExcelMerger:
                             'row_count': len(df)
                         })
                         
-                        print(f"✓ Loaded: {Path(file_path).name} - Sheet: {sheet_name} ({len(df)} rows)")
+                        with self._print_lock:
+                            print(f"✓ Loaded: {filename} - Sheet: {sheet_name} ({len(df)} rows)")
                         
                     except Exception as e:
-                        print(f"✗ Error reading sheet {sheet_name} in {file_path}: {str(e)}")
+                        # Don't cache a partially loaded workbook
+                        cache_path = None
+                        with self._print_lock:
+                            print(f"✗ Error reading sheet {sheet_name} in {file_path}: {str(e)}")
                         
-            except Exception as e:
+        except Exception as e:
+            with self._print_lock:
                 print(f"✗ Error processing file {file_path}: {str(e)}")
+            return file_data
+        
+        if cache_path is not None:
+            try:
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(file_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except Exception as e:
+                with self._print_lock:
+                    print(f"✗ Could not cache {file_path}: {str(e)}")
+        
+        return file_data
+    
+    def extract_dataframes(self, excel_files):
+        """
+        Extract dataframes from all Excel files and worksheets
+        
+        Files are loaded concurrently on a thread pool; results keep the
+        order of excel_files.
+        
+        Args:
+            excel_files: List of Excel file paths
+            
+        Returns:
+            List of dictionaries with file info and dataframes
+        """
+        all_data = []
+        self._cache_ready = bool(self.cache_dir) and self._prepare_cache()
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(excel_files)))) as executor:
+            for done, file_data in enumerate(executor.map(self._load_one_file, excel_files), start=1):
+                all_data.extend(file_data)
+                if self.progress_queue is not None:
+                    self.progress_queue.put(('file', done, len(excel_files)))
         
         return all_data
     
@@ -191,15 +527,73 @@ class ExcelMerger:
         # Create mapping
         column_mapping = {}
         for std_col, occurrences in all_std_columns.items():
-            if len(occurrences) > 0:
-                # Get the most common original column name
-                original_columns = [occ[2] for occ in occurrences]
-                most_common = max(set(original_columns), key=original_columns.count)
-                column_mapping[std_col] = most_common
+            # Get the most common original column name; ties go to the first seen
+            column_mapping[std_col] = Counter(occ[2] for occ in occurrences).most_common(1)[0][0]
         
         print(f"\nDetected {len(column_mapping)} unique standardized columns")
         return column_mapping
     
+    def _empty_column(self, length, dtype=None):
+        """
+        Build an all-missing column for a sheet that lacks a standardized column
+        
+        Datetime and string columns keep their dtype so concatenating them
+        with the sheets that have values does not fall back to object. Text
+        is only read as a string dtype from pandas 3 (object before it).
+        
+        Args:
+            length: Number of rows
+            dtype: Dtype of the column in the sheets that have it (optional)
+            
+        Returns:
+            Array of missing values
+        """
+        if dtype is not None and (pd.api.types.is_datetime64_any_dtype(dtype)
+                                  or isinstance(dtype, pd.StringDtype)):
+            return pd.array([None] * length, dtype=dtype)
+        return np.full(length, np.nan)
+    
+    def _downcast_numeric_columns(self, df, columns):
+        """
+        Downcast integer and float columns in place
+        
+        Args:
+            df: Merged dataframe
+            columns: Columns to consider
+        """
+        for col in columns:
+            if pd.api.types.is_bool_dtype(df[col]):
+                continue
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+            elif pd.api.types.is_float_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], downcast='float')
+    
+    def _drop_duplicate_rows(self, df, columns):
+        """
+        Drop duplicate rows, keeping the first occurrence
+        
+        Rows are hashed first; the exact comparison only runs on rows
+        whose hash is shared with another row.
+        
+        Args:
+            df: Dataframe to deduplicate
+            columns: Columns that identify a duplicate
+            
+        Returns:
+            Dataframe without duplicate rows
+        """
+        row_hashes = pd.util.hash_pandas_object(df[columns], index=False)
+        shared_hash = row_hashes.duplicated(keep=False).to_numpy()
+        
+        keep = ~shared_hash
+        candidates = np.flatnonzero(shared_hash)
+        if len(candidates) > 0:
+            first_seen = ~df[columns].iloc[candidates].duplicated(keep='first').to_numpy()
+            keep[candidates[first_seen]] = True
+        
+        return df[keep]
+    
     def merge_dataframes(self, data_info_list, column_mapping):
         """
         Merge all dataframes using the column mapping
@@ -211,38 +605,52 @@ class ExcelMerger:
         Returns:
             Merged dataframe
         """
-        merged_data = []
+        # Pick each sheet's source column for every standardized column
+        sheet_sources = []
+        dtype_hints = {}
         
         for data_info in data_info_list:
-            df = data_info['dataframe'].copy()
+            df = data_info['dataframe']
             
-            # Create a new dataframe with standardized columns
-            standardized_df = pd.DataFrame()
+            # Map each standardized name to the first column producing it,
+            # reusing the names worked out while loading the sheet
+            std_to_df_col = {}
+            for df_col, std_col in data_info['standardized_columns'].items():
+                std_to_df_col.setdefault(std_col, df_col)
             
+            sources = {}
             for std_col, orig_col in column_mapping.items():
-                # Try to find this column in the current dataframe
-                found = False
-                
-                # Check exact match first
+                # Check exact match first, then the similar column
                 if orig_col in df.columns:
-                    standardized_df[std_col] = df[orig_col].copy()
-                    found = True
+                    sources[std_col] = orig_col
                 else:
-                    # Try to find similar column
-                    for df_col in df.columns:
-                        if self.analyze_column(df_col) == std_col:
-                            standardized_df[std_col] = df[df_col].copy()
-                            found = True
-                            break
+                    sources[std_col] = std_to_df_col.get(std_col)
                 
-                # If not found, add empty column
-                if not found:
-                    standardized_df[std_col] = np.nan
+                # Remember the dtype of the first sheet that has the column
+                if sources[std_col] is not None and std_col not in dtype_hints:
+                    dtype_hints[std_col] = df[sources[std_col]].dtype
+            
+            sheet_sources.append(sources)
+        
+        merged_data = []
+        
+        for data_info, sources in zip(data_info_list, sheet_sources):
+            df = data_info['dataframe']
             
-            # Add source information
-            standardized_df['source_file'] = Path(data_info['file_path']).name
-            standardized_df['source_sheet'] = data_info['sheet_name']
-            standardized_df['merge_timestamp'] = datetime.now()
+            # Collect the standardized columns, then build the frame once
+            columns = {}
+            
+            for std_col, df_col in sources.items():
+                if df_col is not None:
+                    columns[std_col] = df[df_col]
+                else:
+                    # If not found, add empty column
+                    columns[std_col] = self._empty_column(len(df), dtype_hints.get(std_col))
+            
+            # Columns are shared with the source frame; copy-on-write (always on
+            # from pandas 3) keeps either side from changing the other, and
+            # pd.concat copies them into the merged frame anyway
+            standardized_df = pd.DataFrame(columns, index=df.index, copy=False)
             
             merged_data.append(standardized_df)
         
@@ -250,18 +658,51 @@ class ExcelMerger:
         if merged_data:
             master_df = pd.concat(merged_data, ignore_index=True)
             
+            # Add source information as categoricals: one code per row
+            # instead of a repeated string object
+            sheet_lengths = [len(standardized_df) for standardized_df in merged_data]
+            source_columns = {}
+            for column, values in (
+                ('source_file', [info['filename'] for info in data_info_list]),
+                ('source_sheet', [info['sheet_name'] for info in data_info_list]),
+            ):
+                codes, categories = pd.factorize(pd.Series(values, dtype=object))
+                source_columns[column] = pd.Categorical.from_codes(
+                    np.repeat(codes, sheet_lengths), categories=categories
+                )
+            
+            # Join both at once; inserting into the wide, many-block concat
+            # result one column at a time fragments it further
+            master_df = pd.concat(
+                [master_df, pd.DataFrame(source_columns, index=master_df.index)], axis=1
+            )
+            
             # Remove exact duplicates
             initial_count = len(master_df)
             
             # Identify columns for deduplication (excluding source info)
             data_columns = [col for col in master_df.columns 
-                          if col not in ['source_file', 'source_sheet', 'merge_timestamp']]
+                          if col not in ['source_file', 'source_sheet']]
+            
+            # Drop columns with no values in any sheet
+            all_empty = master_df[data_columns].isna().to_numpy().all(axis=0)
+            if all_empty.any():
+                empty_columns = [col for col, empty in zip(data_columns, all_empty) if empty]
+                master_df = master_df.drop(columns=empty_columns)
+                data_columns = [col for col, empty in zip(data_columns, all_empty) if not empty]
+                print(f"Dropped {len(empty_columns)} empty column(s): {', '.join(empty_columns)}")
+            
+            if self.downcast_numeric:
+                self._downcast_numeric_columns(master_df, data_columns)
             
             if len(data_columns) > 0:
-                master_df = master_df.drop_duplicates(subset=data_columns, keep='first')
+                master_df = self._drop_duplicate_rows(master_df, data_columns)
                 duplicates_removed = initial_count - len(master_df)
                 print(f"Removed {duplicates_removed} duplicate records")
             
+            # Record the merge time once instead of as a per-row column
+            master_df.attrs['merge_timestamp'] = datetime.now()
+            
             return master_df
         else:
             return pd.DataFrame()
@@ -283,13 +724,13 @@ class ExcelMerger:
             'total_rows_before_merge': sum(info['row_count'] for info in data_info_list),
             'total_rows_after_merge': len(master_df),
             'unique_columns_found': len(master_df.columns) if not master_df.empty else 0,
-            'merge_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'merge_timestamp': master_df.attrs.get('merge_timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
         }
         
         # File-specific summary
         file_summary = {}
         for info in data_info_list:
-            filename = Path(info['file_path']).name
+            filename = info['filename']
             if filename not in file_summary:
                 file_summary[filename] = {
                     'sheets': [],
@@ -302,42 +743,130 @@ class ExcelMerger:
         
         return summary
     
-    def export_to_excel(self, master_df, summary):
+    def _export_sheets(self, master_df, summary):
         """
-        Export merged data to Excel with multiple sheets
+        Build the sheets of the master file in output order
         
         Args:
             master_df: Merged dataframe
             summary: Summary statistics
-        """
-        with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
-            # Write main data
-            if not master_df.empty:
-                master_df.to_excel(writer, sheet_name='Master_Data', index=False)
             
-            # Write summary
-            summary_df = pd.DataFrame([summary])
-            summary_df.to_excel(writer, sheet_name='Merge_Summary', index=False)
-            
-            # Write column mapping info
-            mapping_df = pd.DataFrame(
-                list(self.column_mappings.items()), 
-                columns=['Standardized_Name', 'Original_Name']
-            )
-            mapping_df.to_excel(writer, sheet_name='Column_Mapping', index=False)
+        Returns:
+            List of (sheet name, dataframe) tuples
+        """
+        sheets = []
+        
+        # Main data, unless it goes to a separate data file
+        if not master_df.empty and self.data_format is None:
+            sheets.append(('Master_Data', master_df))
+        
+        # Summary
+        sheets.append(('Merge_Summary', pd.DataFrame([summary])))
+        
+        # Column mapping info
+        mapping_df = pd.DataFrame(
+            list(self.column_mappings.items()), 
+            columns=['Standardized_Name', 'Original_Name']
+        )
+        sheets.append(('Column_Mapping', mapping_df))
+        
+        # File details
+        file_details = []
+        for filename, details in summary.get('file_details', {}).items():
+            file_details.append({
+                'File_Name': filename,
+                'Sheets': ', '.join(details['sheets']),
+                'Total_Rows': details['total_rows']
+            })
+        
+        if file_details:
+            sheets.append(('File_Details', pd.DataFrame(file_details)))
+        
+        return sheets
+    
+    def _write_sheets_streaming(self, sheets):
+        """
+        Write sheets row by row with xlsxwriter in constant memory mode
+        
+        Args:
+            sheets: List of (sheet name, dataframe) tuples
+        """
+        options = {
+            'constant_memory': True,
+            'strings_to_urls': False,
+            'nan_inf_to_errors': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        }
+        
+        with xlsxwriter.Workbook(self.output_path, options) as workbook:
+            header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
             
-            # Write file details
-            file_details = []
-            for filename, details in summary.get('file_details', {}).items():
-                file_details.append({
-                    'File_Name': filename,
-                    'Sheets': ', '.join(details['sheets']),
-                    'Total_Rows': details['total_rows']
-                })
+            for sheet_name, df in sheets:
+                worksheet = workbook.add_worksheet(sheet_name)
+                worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+                
+                # Convert a slice of rows at a time, so only one chunk of the
+                # sheet is held as Python objects; missing values become blank cells
+                for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+                    chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+                    values = chunk.astype(object).where(chunk.notna(), None)
+                    for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=start + 1):
+                        worksheet.write_row(row_idx, 0, [
+                            value if value is None or isinstance(value, XLSX_CELL_TYPES) else str(value)
+                            for value in row
+                        ])
+    
+    def _export_data_file(self, master_df):
+        """
+        Write the merged rows to a CSV or parquet file next to the master file
+        
+        Parquet needs one type per column; if pyarrow rejects the data the
+        rows are written as CSV instead.
+        
+        Args:
+            master_df: Merged dataframe
             
-            if file_details:
-                file_details_df = pd.DataFrame(file_details)
-                file_details_df.to_excel(writer, sheet_name='File_Details', index=False)
+        Returns:
+            Path of the written data file
+        """
+        data_path = Path(self.output_path).with_suffix(f".{self.data_format}")
+        
+        if self.data_format == 'parquet':
+            try:
+                master_df.to_parquet(data_path, compression='zstd', index=False)
+                return data_path
+            except Exception as e:
+                print(f"✗ Could not write parquet, writing CSV instead: {str(e)}")
+                data_path = data_path.with_suffix('.csv')
+        
+        master_df.to_csv(data_path, index=False)
+        return data_path
+    
+    def export_to_excel(self, master_df, summary):
+        """
+        Export merged data to Excel with multiple sheets
+        
+        Uses xlsxwriter's streaming writer when it is installed and
+        falls back to openpyxl otherwise. With a data_format set, the
+        merged rows go to a separate CSV or parquet file and the workbook
+        only holds the summary sheets.
+        
+        Args:
+            master_df: Merged dataframe
+            summary: Summary statistics
+        """
+        if self.data_format and not master_df.empty:
+            summary['data_file'] = str(self._export_data_file(master_df))
+            print(f"\n✅ Merged data written: {summary['data_file']}")
+        
+        sheets = self._export_sheets(master_df, summary)
+        
+        if HAS_XLSXWRITER:
+            self._write_sheets_streaming(sheets)
+        else:
+            with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
+                for sheet_name, df in sheets:
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
         
         print(f"\n✅ Master file created: {self.output_path}")
         print(f"   Total rows: {summary['total_rows_after_merge']}")
@@ -396,6 +925,11 @@ class ExcelMerger:
         print("MERGING DATA...")
         master_df = self.merge_dataframes(data_info_list, self.column_mappings)
         
+        # The merged frame holds its own copy of the rows; release the loaded
+        # sheets before the summary and export, which only need their metadata
+        for data_info in data_info_list:
+            data_info.pop('dataframe', None)
+        
         if master_df.empty:
             print("No data to merge!")
             return None, None
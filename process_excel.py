@@ -1,49 +1,45 @@
-import pandas as pd
-import json
+import orjson
 import os
+import multiprocessing
 from datetime import datetime
+from functools import partial
 
-def process_excel_files():
-    """
-    Process all Excel files in the current folder
+from excel_sheets import json_default, open_excel_file, read_sheet_sample, sample_records
+
+# orjson output options: 2-space indented like json.dump(indent=2), with numpy
+# scalars and non-string keys (e.g. Timestamp headers) encoded natively
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Extensions (lower case) of the files picked up from the current folder
+EXCEL_EXTENSIONS = frozenset({'.xlsx', '.xls', '.xlsm'})
+
+# Spaces and dots in a workbook name become underscores in its JSON file name
+JSON_NAME_TABLE = str.maketrans({' ': '_', '.': '_'})
+
+def process_one_file(filename, folder_path, output_folder):
     """
+    Convert one Excel file into a JSON info file
     
-    # Use current directory
-    folder_path = os.getcwd()
-    
-    # Create output folder with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_folder = os.path.join(folder_path, f"excel_json_output_{timestamp}")
-    os.makedirs(output_folder, exist_ok=True)
-    
-    # Get all Excel files
-    excel_files = [f for f in os.listdir(folder_path) 
-                   if f.endswith(('.xlsx', '.xls', '.xlsm'))]
-    
-    if not excel_files:
-        print("No Excel files found in the current folder.")
-        return
-    
-    print(f"Current folder: {folder_path}")
-    print(f"Found {len(excel_files)} Excel file(s)")
-    print(f"Output folder: {output_folder}\n")
+    Returns the lines to print for this file, so output from parallel
+    workers doesn't interleave, and the file's summary entry (None if the
+    JSON file couldn't be saved).
+    """
+    lines = [f"Processing: {filename}"]
+    summary_entry = None
+    file_path = os.path.join(folder_path, filename)
     
-    # Process each file
-    for filename in excel_files:
-        print(f"Processing: {filename}")
-        file_path = os.path.join(folder_path, filename)
+    try:
+        # One stat call for both the size and the modification time
+        file_stat = os.stat(file_path)
         
-        try:
-            # Read Excel file
-            excel_file = pd.ExcelFile(file_path)
-            
+        # Open the workbook once; every sheet is read from this handle and
+        # it is closed as soon as the sheets have been read
+        with open_excel_file(file_path) as excel_file:
             # Prepare data structure
             file_data = {
                 "filename": filename,
-                "file_size": os.path.getsize(file_path),
-                "last_modified": datetime.fromtimestamp(
-                    os.path.getmtime(file_path)
-                ).isoformat(),
+                "file_size": file_stat.st_size,
+                "last_modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
                 "total_sheets": len(excel_file.sheet_names),
                 "sheets": {}
             }
@@ -51,95 +47,112 @@ def process_excel_files():
             # Process each sheet
             for sheet_name in excel_file.sheet_names:
                 try:
-                    # Read sheet
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    
-                    # Get column info
-                    columns = []
-                    for col in df.columns:
-                        columns.append({
-                            "name": str(col),
-                            "dtype": str(df[col].dtype),
-                            "non_null_count": int(df[col].count())
-                        })
+                    # Read only the header and sample rows, with the row count
+                    # from the same parse of the sheet
+                    df, total_rows = read_sheet_sample(excel_file, sheet_name, 3)
                     
-                    # Get sample data (first 3 rows)
-                    sample_data = df.head(3).fillna("").to_dict('records')
+                    # Get column info in one pass over df.dtypes instead of a
+                    # df[col] lookup per column
+                    columns = [
+                        {"name": str(col), "dtype": dtype}
+                        for col, dtype in zip(df.columns, df.dtypes.astype(str))
+                    ]
                     
-                    # Handle special data types
-                    for row in sample_data:
-                        for key, value in row.items():
-                            if pd.isna(value):
-                                row[key] = None
-                            elif hasattr(value, 'isoformat'):
-                                row[key] = value.isoformat()
-                            else:
-                                try:
-                                    json.dumps(value)
-                                except:
-                                    row[key] = str(value)
+                    # Get sample data (first 3 rows; df holds only those, so no
+                    # head() copy is needed), with missing values as null
+                    sample_data = sample_records(df)
                     
                     # Store sheet info
                     file_data["sheets"][sheet_name] = {
-                        "total_rows": len(df),
+                        "total_rows": total_rows,
                         "total_columns": len(df.columns),
                         "columns": columns,
                         "sample_data_first_3_rows": sample_data
                     }
                     
-                    print(f"  ✓ Sheet: {sheet_name} ({len(df.columns)} cols, {len(df)} rows)")
+                    lines.append(f"  ✓ Sheet: {sheet_name} ({len(df.columns)} cols, {total_rows} rows)")
                     
                 except Exception as e:
-                    print(f"  ✗ Error in sheet '{sheet_name}': {str(e)}")
+                    lines.append(f"  ✗ Error in sheet '{sheet_name}': {str(e)}")
                     file_data["sheets"][sheet_name] = {"error": str(e)}
-            
-            # Save JSON file
-            json_filename = filename.replace(' ', '_').replace('.', '_') + '_info.json'
-            json_path = os.path.join(output_folder, json_filename)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(file_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"  ✅ Saved: {json_filename}\n")
-            
-        except Exception as e:
-            print(f"  ❌ Error processing file: {str(e)}\n")
+        
+        # Save JSON file
+        json_filename = filename.translate(JSON_NAME_TABLE) + '_info.json'
+        json_path = os.path.join(output_folder, json_filename)
+        
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(file_data, default=json_default, option=JSON_OPTIONS))
+        
+        lines.append(f"  ✅ Saved: {json_filename}\n")
+        summary_entry = {
+            'filename': filename,
+            'sheets': len(file_data["sheets"]),
+            'json_file': json_filename
+        }
+        
+    except Exception as e:
+        lines.append(f"  ❌ Error processing file: {str(e)}\n")
+    
+    return lines, summary_entry
+
+def process_excel_files():
+    """
+    Process all Excel files in the current folder
+    """
+    
+    # Use current directory
+    folder_path = os.getcwd()
+    
+    # Create output folder with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_folder = os.path.join(folder_path, f"excel_json_output_{timestamp}")
+    os.makedirs(output_folder, exist_ok=True)
+    
+    # Get all Excel files in a single directory scan (is_file() is answered
+    # from the directory entry, without an extra stat call)
+    with os.scandir(folder_path) as entries:
+        excel_files = [entry.name for entry in entries
+                       if os.path.splitext(entry.name)[1].lower() in EXCEL_EXTENSIONS
+                       and entry.is_file()]
+    
+    if not excel_files:
+        print("No Excel files found in the current folder.")
+        return
+    
+    print(f"Current folder: {folder_path}")
+    print(f"Found {len(excel_files)} Excel file(s)")
+    print(f"Output folder: {output_folder}\n")
+    
+    # Process files in parallel, one worker process per core; each file's
+    # output is printed as soon as it finishes
+    summary_entries = []
+    worker = partial(process_one_file, folder_path=folder_path, output_folder=output_folder)
+    with multiprocessing.Pool(min(os.cpu_count() or 1, len(excel_files))) as pool:
+        for lines, summary_entry in pool.imap_unordered(worker, excel_files):
+            print("\n".join(lines))
+            if summary_entry is not None:
+                summary_entries.append(summary_entry)
     
     # Create summary
-    create_summary(output_folder)
+    create_summary(output_folder, summary_entries)
     
     print(f"\n🎉 All done! JSON files saved in: {output_folder}")
 
-def create_summary(output_folder):
-    """Create a summary of all processed files"""
-    json_files = [f for f in os.listdir(output_folder) 
-                  if f.endswith('_info.json')]
-    
+def create_summary(output_folder, summary_entries):
+    """
+    Create a summary of all processed files from the entries returned by
+    process_one_file, without reading the saved JSON files back
+    """
     summary = {
-        "total_files": len(json_files),
-        "total_sheets": 0,
-        "files": []
+        "total_files": len(summary_entries),
+        "total_sheets": sum(entry['sheets'] for entry in summary_entries),
+        "files": summary_entries
     }
     
-    for json_file in json_files:
-        json_path = os.path.join(output_folder, json_file)
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                sheet_count = len(data.get('sheets', {}))
-                summary['total_sheets'] += sheet_count
-                summary['files'].append({
-                    'filename': data['filename'],
-                    'sheets': sheet_count,
-                    'json_file': json_file
-                })
-        except:
-            pass
-    
     # Save summary
     summary_path = os.path.join(output_folder, 'summary.json')
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2)
+    with open(summary_path, 'wb') as f:
+        f.write(orjson.dumps(summary, option=JSON_OPTIONS))
     
     print(f"📊 Summary: {summary['total_files']} files, {summary['total_sheets']} sheets")
     print(f"📋 Summary saved to: {summary_path}")
@@ -1,8 +1,18 @@
 import pandas as pd
-import json
+import orjson
 import os
+import multiprocessing
 from datetime import datetime, date
 import numpy as np
+from functools import partial
+
+from excel_sheets import open_excel_file, read_sheet_sample, sample_records
+
+# Same layout as the json.dump(indent=2) output this script used to write
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Spaces and dots in a workbook name become underscores in its JSON file name
+JSON_NAME_TABLE = str.maketrans({' ': '_', '.': '_'})
 
 # List of files that failed previously
 FAILED_FILES = [
@@ -29,47 +39,30 @@ def convert_to_serializable(obj):
     elif pd.isna(obj):
         return None
     else:
-        try:
-            json.dumps(obj)
-            return obj
-        except (TypeError, OverflowError):
-            return str(obj)
+        # Only called by orjson for values it can't encode itself, so there
+        # is no need to trial-encode them first
+        return str(obj)
 
-def process_failed_files():
-    """Process only the files that failed previously"""
-    
-    folder_path = os.getcwd()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_folder = os.path.join(folder_path, f"excel_json_output_failed_files_{timestamp}")
-    os.makedirs(output_folder, exist_ok=True)
-    
-    print("=" * 60)
-    print("PROCESSING FAILED FILES ONLY")
-    print("=" * 60)
-    print(f"Current folder: {folder_path}")
-    print(f"Output folder: {output_folder}\n")
+def process_one_file(filename, folder_path, output_folder):
+    """
+    Convert one previously failed Excel file into a JSON info file
     
-    successful = 0
-    failed = 0
+    Returns whether the file was saved and the lines to print for it, so
+    output from parallel workers doesn't interleave.
+    """
+    lines = [f"\nProcessing: {filename}"]
+    file_path = os.path.join(folder_path, filename)
     
-    for filename in FAILED_FILES:
-        if not os.path.exists(filename):
-            print(f"⚠️  File not found: {filename}")
-            continue
-            
-        print(f"\nProcessing: {filename}")
-        file_path = os.path.join(folder_path, filename)
+    try:
+        # One stat call for both the size and the modification time
+        file_stat = os.stat(file_path)
         
-        try:
-            # Read Excel file
-            excel_file = pd.ExcelFile(file_path)
-            
+        # Read Excel file (closed again once all sheets have been read)
+        with open_excel_file(file_path) as excel_file:
             file_data = {
                 "filename": filename,
-                "file_size": os.path.getsize(file_path),
-                "last_modified": datetime.fromtimestamp(
-                    os.path.getmtime(file_path)
-                ).isoformat(),
+                "file_size": file_stat.st_size,
+                "last_modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
                 "total_sheets": len(excel_file.sheet_names),
                 "sheets": {}
             }
@@ -77,56 +70,87 @@ def process_failed_files():
             sheet_count = 0
             for sheet_name in excel_file.sheet_names:
                 try:
-                    # Read sheet
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
+                    # Read only the header and sample rows, with the row count
+                    # from the same parse of the sheet
+                    df, total_rows = read_sheet_sample(excel_file, sheet_name, 3)
                     
                     # Convert column names to strings (fix for datetime headers)
                     df.columns = df.columns.astype(str)
                     
-                    # Get column info
-                    columns = []
-                    for col in df.columns:
-                        columns.append({
-                            "name": str(col),
-                            "dtype": str(df[col].dtype),
-                            "non_null_count": int(df[col].count())
-                        })
+                    # Get column info in one pass over df.dtypes instead of a
+                    # df[col] lookup per column
+                    columns = [
+                        {"name": str(col), "dtype": dtype}
+                        for col, dtype in zip(df.columns, df.dtypes.astype(str))
+                    ]
                     
-                    # Get sample data and convert to serializable format
-                    sample_data = []
-                    for _, row in df.head(3).iterrows():
-                        row_dict = {}
-                        for col, value in row.items():
-                            row_dict[str(col)] = convert_to_serializable(value)
-                        sample_data.append(row_dict)
+                    # Get sample data (df holds only the first 3 rows, so no head()
+                    # copy is needed), with missing values as null
+                    sample_data = sample_records(df)
                     
                     file_data["sheets"][sheet_name] = {
-                        "total_rows": len(df),
+                        "total_rows": total_rows,
                         "total_columns": len(df.columns),
                         "columns": columns,
                         "sample_data_first_3_rows": sample_data
                     }
                     
                     sheet_count += 1
-                    print(f"  ✓ Sheet: {sheet_name} ({len(df.columns)} cols, {len(df)} rows)")
+                    lines.append(f"  ✓ Sheet: {sheet_name} ({len(df.columns)} cols, {total_rows} rows)")
                     
                 except Exception as e:
-                    print(f"  ✗ Error in sheet '{sheet_name}': {str(e)}")
+                    lines.append(f"  ✗ Error in sheet '{sheet_name}': {str(e)}")
                     file_data["sheets"][sheet_name] = {"error": str(e)}
-            
-            # Save JSON file
-            json_filename = filename.replace(' ', '_').replace('.', '_') + '_info.json'
-            json_path = os.path.join(output_folder, json_filename)
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(file_data, f, indent=2, default=convert_to_serializable)
-            
-            print(f"  ✅ Saved: {json_filename} ({sheet_count} sheets)")
-            successful += 1
-            
-        except Exception as e:
-            print(f"  ❌ Error processing file: {str(e)}")
-            failed += 1
+        
+        # Save JSON file
+        json_filename = filename.translate(JSON_NAME_TABLE) + '_info.json'
+        json_path = os.path.join(output_folder, json_filename)
+        
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(file_data, default=convert_to_serializable, option=JSON_OPTIONS))
+        
+        lines.append(f"  ✅ Saved: {json_filename} ({sheet_count} sheets)")
+        return True, lines
+        
+    except Exception as e:
+        lines.append(f"  ❌ Error processing file: {str(e)}")
+        return False, lines
+
+def process_failed_files():
+    """Process only the files that failed previously"""
+    
+    folder_path = os.getcwd()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_folder = os.path.join(folder_path, f"excel_json_output_failed_files_{timestamp}")
+    os.makedirs(output_folder, exist_ok=True)
+    
+    print("=" * 60)
+    print("PROCESSING FAILED FILES ONLY")
+    print("=" * 60)
+    print(f"Current folder: {folder_path}")
+    print(f"Output folder: {output_folder}\n")
+    
+    successful = 0
+    failed = 0
+    
+    files_to_process = []
+    for filename in FAILED_FILES:
+        if not os.path.exists(filename):
+            print(f"⚠️  File not found: {filename}")
+            continue
+        files_to_process.append(filename)
+    
+    # Process files in parallel, one worker process per core; each file's
+    # output is printed as soon as it finishes
+    if files_to_process:
+        worker = partial(process_one_file, folder_path=folder_path, output_folder=output_folder)
+        with multiprocessing.Pool(min(os.cpu_count() or 1, len(files_to_process))) as pool:
+            for saved, lines in pool.imap_unordered(worker, files_to_process):
+                print("\n".join(lines))
+                if saved:
+                    successful += 1
+                else:
+                    failed += 1
     
     # Print summary
     print("\n" + "=" * 60)